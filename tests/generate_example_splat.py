@@ -1,152 +1,266 @@
-import struct
+import argparse
 import math
-import random
-import colorsys
 
-random.seed(42)
+import numpy as np
+
+# One splat per record, laid out exactly like the extended 56-byte SPLAT format
+SPLAT_DTYPE = np.dtype([
+    ('pos', '<f4', 3),
+    ('scale', '<f4', 3),
+    ('quat', '<f4', 4),  # (x, y, z, w)
+    ('color', '<f4', 3),
+    ('opacity', '<f4'),
+])
 
 def hsv_to_rgb(h, s, v):
-    """Convert HSV (0-1 range) to RGB (0-1 range)"""
-    return colorsys.hsv_to_rgb(h % 1.0, s, v)
+    """Convert HSV arrays (0-1 range) to RGB arrays (0-1 range)"""
+    h, s, v = np.broadcast_arrays(np.mod(h, 1.0) * 6.0, s, v)
+    i = h.astype(np.int32)
+    f = h - i
+    i %= 6  # Hues that round up to exactly 1.0 land in sector 6
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    # Pick each channel from the hue sector, same table as colorsys
+    sectors = np.stack([v, q, p, p, t, v])
+    idx = np.arange(len(h))
+    r = sectors[i, idx]
+    g = sectors[(i + 4) % 6, idx]
+    b = sectors[(i + 2) % 6, idx]
+    return r, g, b
 
 def make_splat(x, y, z, r, g, b, sx=0.1, sy=0.1, sz=0.1, opacity=1.0):
-    """Helper to create a splat tuple with identity rotation"""
-    return (x, y, z, sx, sy, sz, 0.0, 0.0, 0.0, 1.0, r, g, b, opacity)
+    """Helper to create a SPLAT_DTYPE array with identity rotation"""
+    splats = np.empty(len(x), dtype=SPLAT_DTYPE)
+    pos, scale, color = splats['pos'], splats['scale'], splats['color']
+    pos[:, 0], pos[:, 1], pos[:, 2] = x, y, z
+    scale[:, 0], scale[:, 1], scale[:, 2] = sx, sy, sz
+    splats['quat'] = (0.0, 0.0, 0.0, 1.0)
+    color[:, 0], color[:, 1], color[:, 2] = r, g, b
+    splats['opacity'] = opacity
+    return splats
+
+def create_example_splat(num_random=875, seed=42):
+    """Create a 5x5x5 color cube surrounded by randomly oriented splats"""
+    rng = np.random.default_rng(seed)
+    # Color cube: position and color both follow the grid index
+    i, j, k = np.mgrid[0:5, 0:5, 0:5]
+    ijk = np.column_stack([i.ravel(), j.ravel(), k.ravel()])
+    cube = np.empty(len(ijk), dtype=SPLAT_DTYPE)
+    cube['pos'] = (ijk - 2.0) * 0.5
+    cube['scale'] = 0.1
+    cube['quat'] = (0.0, 0.0, 0.0, 1.0)  # Identity rotation
+    cube['color'] = ijk / 4.0
+    cube['opacity'] = 1.0
+
+    # Random splats in a spherical shell around the cube. Directions come
+    # from a Fibonacci sphere so they cover it evenly instead of bunching
+    # up at the poles the way uniform (theta, phi) samples do
+    n = np.arange(num_random)
+    phi = np.arccos(1 - 2 * (n + 0.5) / num_random)
+    theta = math.pi * (1 + math.sqrt(5)) * n
+    radius = rng.uniform(0.5, 2.0, num_random)
+    sin_phi = np.sin(phi)
+    scattered = np.empty(num_random, dtype=SPLAT_DTYPE)
+    pos = scattered['pos']
+    pos[:, 0] = radius * sin_phi * np.cos(theta)
+    pos[:, 1] = radius * sin_phi * np.sin(theta)
+    pos[:, 2] = radius * np.cos(phi)
+    scattered['scale'] = rng.uniform(0.05, 0.2, (num_random, 3))
+    # Normalized Gaussian 4-vectors are uniform on S^3, i.e. uniformly
+    # distributed rotations (normalized uniform samples favor the corners)
+    q = rng.normal(size=(num_random, 4))
+    scattered['quat'] = q / np.linalg.norm(q, axis=1, keepdims=True)
+    scattered['color'] = rng.uniform(0.0, 1.0, (num_random, 3))
+    scattered['opacity'] = rng.uniform(0.5, 1.0, num_random)
 
-def create_spiral_galaxy(num_points=8000):
+    return np.concatenate([cube, scattered])
+
+def create_spiral_galaxy(num_points=8000, seed=42):
     """Create a spiral galaxy with dense core and sweeping arms"""
-    splats = []
+    rng = np.random.default_rng(seed)
     num_arms = 3
     arm_spread = 0.4
 
-    for i in range(num_points):
-        t = i / num_points
-
-        if t < 0.2:
-            # Dense galactic core (20% of points)
-            r = random.gauss(0, 0.3)
-            angle = random.uniform(0, 2 * math.pi)
-            x = r * math.cos(angle)
-            z = r * math.sin(angle)
-            y = random.gauss(0, 0.05)  # Thin disk
-            hue = 0.08 + random.gauss(0, 0.03)  # Warm yellow-white core
-            sat = random.uniform(0.1, 0.4)
-            val = random.uniform(0.85, 1.0)
-        else:
-            # Spiral arms
-            arm = random.randint(0, num_arms - 1)
-            arm_angle = (2 * math.pi / num_arms) * arm
-            dist = random.uniform(0.3, 3.0)
-            # Logarithmic spiral: angle increases with log of distance
-            spiral_angle = arm_angle + 1.2 * math.log(1 + dist * 2)
-            # Add spread that increases with distance
-            spread = arm_spread * dist * 0.3
-            x = dist * math.cos(spiral_angle) + random.gauss(0, spread)
-            z = dist * math.sin(spiral_angle) + random.gauss(0, spread)
-            y = random.gauss(0, 0.03 + 0.02 * dist)  # Slightly thicker at edges
-
-            # Color: blue-white in arms, reddish at edges
-            hue = 0.6 - dist * 0.08 + random.gauss(0, 0.03)  # Blue shifting to purple
-            sat = 0.4 + dist * 0.1
-            val = max(0.4, 1.0 - dist * 0.15)
-
-        r, g, b = hsv_to_rgb(hue, min(sat, 1.0), val)
-        splats.append(make_splat(x, y, z, r, g, b, opacity=random.uniform(0.7, 1.0)))
+    t = np.arange(num_points) / num_points
+    core = t < 0.2
+    arms = ~core
+    num_core = np.count_nonzero(core)
+    num_arm = num_points - num_core
 
-    return splats
+    x, y, z = np.empty((3, num_points))
+    hue, sat, val = np.empty((3, num_points))
+
+    # Dense galactic core (20% of points)
+    r = rng.normal(0, 0.3, num_core)
+    angle = rng.uniform(0, 2 * math.pi, num_core)
+    x[core] = r * np.cos(angle)
+    z[core] = r * np.sin(angle)
+    y[core] = rng.normal(0, 0.05, num_core)  # Thin disk
+    hue[core] = 0.08 + rng.normal(0, 0.03, num_core)  # Warm yellow-white core
+    sat[core] = rng.uniform(0.1, 0.4, num_core)
+    val[core] = rng.uniform(0.85, 1.0, num_core)
 
-def create_dna_helix(num_points=8000):
+    # Spiral arms
+    arm = rng.integers(0, num_arms, num_arm)
+    arm_angle = (2 * math.pi / num_arms) * arm
+    dist = rng.uniform(0.3, 3.0, num_arm)
+    # Logarithmic spiral: angle increases with log of distance
+    spiral_angle = arm_angle + 1.2 * np.log(1 + dist * 2)
+    # Add spread that increases with distance
+    spread = arm_spread * dist * 0.3
+    x[arms] = dist * np.cos(spiral_angle) + rng.normal(0, spread)
+    z[arms] = dist * np.sin(spiral_angle) + rng.normal(0, spread)
+    y[arms] = rng.normal(0, 0.03 + 0.02 * dist)  # Slightly thicker at edges
+
+    # Color: blue-white in arms, reddish at edges
+    hue[arms] = 0.6 - dist * 0.08 + rng.normal(0, 0.03, num_arm)  # Blue shifting to purple
+    sat[arms] = 0.4 + dist * 0.1
+    val[arms] = np.maximum(0.4, 1.0 - dist * 0.15)
+
+    r, g, b = hsv_to_rgb(hue, np.minimum(sat, 1.0), val)
+    opacity = rng.uniform(0.7, 1.0, num_points)
+    return make_splat(x, y, z, r, g, b, opacity=opacity)
+
+def create_dna_helix(num_points=8000, seed=42):
     """Create a DNA double helix with base pair connections"""
-    splats = []
+    rng = np.random.default_rng(seed)
     helix_height = 6.0
     helix_radius = 1.0
     turns = 4
 
-    for i in range(num_points):
-        t = i / num_points
-
-        if t < 0.35:
-            # First strand
-            progress = (t / 0.35)
-            angle = progress * turns * 2 * math.pi
-            y = progress * helix_height - helix_height / 2
-            x = helix_radius * math.cos(angle) + random.gauss(0, 0.03)
-            z = helix_radius * math.sin(angle) + random.gauss(0, 0.03)
-            hue = 0.55  # Cyan
-            sat, val = 0.8, 0.9
-        elif t < 0.7:
-            # Second strand (offset by pi)
-            progress = ((t - 0.35) / 0.35)
-            angle = progress * turns * 2 * math.pi + math.pi
-            y = progress * helix_height - helix_height / 2
-            x = helix_radius * math.cos(angle) + random.gauss(0, 0.03)
-            z = helix_radius * math.sin(angle) + random.gauss(0, 0.03)
-            hue = 0.75  # Purple
-            sat, val = 0.7, 0.9
-        else:
-            # Base pairs connecting the two strands
-            progress = ((t - 0.7) / 0.3)
-            angle = progress * turns * 2 * math.pi
-            y = progress * helix_height - helix_height / 2
-            # Interpolate between the two strand positions
-            lerp = random.uniform(0.0, 1.0)
-            x1 = helix_radius * math.cos(angle)
-            z1 = helix_radius * math.sin(angle)
-            x2 = helix_radius * math.cos(angle + math.pi)
-            z2 = helix_radius * math.sin(angle + math.pi)
-            x = x1 * lerp + x2 * (1 - lerp) + random.gauss(0, 0.02)
-            z = z1 * lerp + z2 * (1 - lerp) + random.gauss(0, 0.02)
-            y += random.gauss(0, 0.02)
-            # Color based on position between strands
-            hue = 0.0 + lerp * 0.15  # Red to orange
-            sat, val = 0.9, 0.95
-
-        r, g, b = hsv_to_rgb(hue, sat, val)
-        splats.append(make_splat(x, y, z, r, g, b))
+    t = np.arange(num_points) / num_points
+    first = t < 0.35
+    second = (t >= 0.35) & (t < 0.7)
+    pairs = t >= 0.7
+    strands = ~pairs
+    num_strand = np.count_nonzero(strands)
+    num_pair = num_points - num_strand
 
-    return splats
+    progress = np.where(first, t / 0.35, np.where(second, (t - 0.35) / 0.35, (t - 0.7) / 0.3))
+    angle = progress * turns * 2 * math.pi
+    angle[second] += math.pi  # Second strand is offset by pi
+    x, z = np.empty((2, num_points))
+    y = progress * helix_height - helix_height / 2
+
+    # Both strands follow the helix with a little jitter
+    x[strands] = helix_radius * np.cos(angle[strands]) + rng.normal(0, 0.03, num_strand)
+    z[strands] = helix_radius * np.sin(angle[strands]) + rng.normal(0, 0.03, num_strand)
+
+    # Base pairs connecting the two strands
+    pair_angle = angle[pairs]
+    # Interpolate between the two strand positions
+    lerp = rng.uniform(0.0, 1.0, num_pair)
+    x1 = helix_radius * np.cos(pair_angle)
+    z1 = helix_radius * np.sin(pair_angle)
+    x2 = helix_radius * np.cos(pair_angle + math.pi)
+    z2 = helix_radius * np.sin(pair_angle + math.pi)
+    x[pairs] = x1 * lerp + x2 * (1 - lerp) + rng.normal(0, 0.02, num_pair)
+    z[pairs] = z1 * lerp + z2 * (1 - lerp) + rng.normal(0, 0.02, num_pair)
+    y[pairs] += rng.normal(0, 0.02, num_pair)
 
-def create_torus_knot(num_points=8000):
+    hue = np.where(first, 0.55, 0.75)  # Cyan, purple
+    sat = np.where(first, 0.8, 0.7)
+    val = np.full(num_points, 0.9)
+    # Base pair color based on position between strands
+    hue[pairs] = 0.0 + lerp * 0.15  # Red to orange
+    sat[pairs] = 0.9
+    val[pairs] = 0.95
+
+    r, g, b = hsv_to_rgb(hue, sat, val)
+    return make_splat(x, y, z, r, g, b)
+
+def create_torus_knot(num_points=8000, seed=42):
     """Create a trefoil torus knot with flowing HSV colors"""
-    splats = []
+    rng = np.random.default_rng(seed)
     # Torus knot parameters: p wraps around the hole, q wraps through the hole
     p, q = 2, 3
     R = 2.0   # Major radius
     r = 0.6   # Minor radius (tube thickness)
 
-    for i in range(num_points):
-        t = (i / num_points) * 2 * math.pi
+    u = np.arange(num_points) / num_points
+    t = u * 2 * math.pi
 
-        # Torus knot centerline
-        cx = (R + r * math.cos(q * t)) * math.cos(p * t)
-        cy = (R + r * math.cos(q * t)) * math.sin(p * t)
-        cz = r * math.sin(q * t)
+    # Torus knot centerline, evaluating each sin/cos table once
+    cos_p, sin_p = np.cos(p * t), np.sin(p * t)
+    cos_q, sin_q = np.cos(q * t), np.sin(q * t)
+    radius = R + r * cos_q
+    cx = radius * cos_p
+    cy = radius * sin_p
+    cz = r * sin_q
 
-        # Add thickness around the centerline
-        spread = 0.12
-        cx += random.gauss(0, spread)
-        cy += random.gauss(0, spread)
-        cz += random.gauss(0, spread)
+    # Add thickness around the centerline
+    spread = 0.12
+    cx += rng.normal(0, spread, num_points)
+    cy += rng.normal(0, spread, num_points)
+    cz += rng.normal(0, spread, num_points)
 
-        # Smooth HSV gradient following the curve
-        hue = (i / num_points) * 3  # Cycle through spectrum 3 times
-        sat = 0.85
-        val = 0.7 + 0.3 * math.sin(t * 5)  # Subtle brightness wave
+    # Smooth HSV gradient following the curve
+    hue = u * 3  # Cycle through spectrum 3 times
+    sat = 0.85
+    val = 0.7 + 0.3 * np.sin(t * 5)  # Subtle brightness wave
 
-        rv, gv, bv = hsv_to_rgb(hue, sat, val)
-        splats.append(make_splat(cx, cz, cy, rv, gv, bv))  # Swap y/z so knot lies flat
+    rv, gv, bv = hsv_to_rgb(hue, sat, val)
+    return make_splat(cx, cz, cy, rv, gv, bv)  # Swap y/z so knot lies flat
 
-    return splats
+def check_splats(splats):
+    """Raise if splats is not a SPLAT_DTYPE array, as returned by the generators"""
+    # Never cast: np.asarray would broadcast an (N, 14) float array into
+    # an (N, 14) array of records and silently write 14x the data
+    dtype = getattr(splats, 'dtype', None)
+    if dtype != SPLAT_DTYPE or splats.ndim != 1:
+        raise ValueError(f"Expected a 1-D SPLAT_DTYPE array, got dtype {dtype} with shape {np.shape(splats)}")
 
 def write_splat_file(filename, splats):
     """Write splats to a binary SPLAT file"""
+    check_splats(splats)
+    # SPLAT_DTYPE already matches the file layout, so the records are
+    # written straight from the array's memory with no per-splat handling
+    splats.tofile(filename)
+
+def write_splat_file_compact(filename, splats):
+    """Write splats to a binary SPLAT file in the standard 32-byte layout
+
+    Position and scale stay float32; color/opacity become RGBA u8 and the
+    rotation is stored as (w, x, y, z) mapped from [-1, 1] to u8, as in
+    antimatter15/splat.
+    """
+    check_splats(splats)
+    out = np.empty(len(splats), dtype=np.dtype([
+        ('pos', '<f4', 3), ('scale', '<f4', 3), ('rgba', 'u1', 4), ('rot', 'u1', 4),
+    ]))
+    out['pos'] = splats['pos']
+    out['scale'] = splats['scale']
+    out['rgba'][:, 0:3] = np.clip(splats['color'] * 255, 0, 255)
+    out['rgba'][:, 3] = np.clip(splats['opacity'] * 255, 0, 255)
+    out['rot'] = np.clip(splats['quat'][:, [3, 0, 1, 2]] * 128 + 128, 0, 255)
+    out.tofile(filename)
+
+def write_splat_file_compressed(filename, splats):
+    """Write splats as a Blosc/LZ4-compressed SPLAT file (.splat.blp)
+
+    The payload is the same SPLAT_DTYPE buffer as write_splat_file,
+    compressed as a single Blosc chunk with byte shuffling. The chunk starts
+    with the standard 16-byte Blosc header, so readers can detect it and
+    size their output buffer before decompressing:
+      byte 0: format version, byte 3: typesize (4),
+      bytes 4-7: uncompressed size (u32 LE), bytes 12-15: compressed size (u32 LE)
+
+    Requires the optional blosc2 package.
+    """
+    try:
+        import blosc2
+    except ImportError as e:
+        raise ImportError("Compressed SPLAT output requires blosc2 (pip install blosc2)") from e
+
+    check_splats(splats)
+    packed = blosc2.compress(np.ascontiguousarray(splats), typesize=4, clevel=5, codec=blosc2.Codec.LZ4)
     with open(filename, 'wb') as f:
-        for splat in splats:
-            packed = struct.pack('14f', *splat)
-            f.write(packed)
+        f.write(packed)
 
 def write_ply_file(filename, splats):
     """Write splats as a PLY file"""
+    check_splats(splats)
     with open(filename, 'w') as f:
         f.write("ply\n")
         f.write("format ascii 1.0\n")
@@ -159,33 +273,45 @@ def write_ply_file(filename, splats):
         f.write("property uchar blue\n")
         f.write("end_header\n")
 
-        for splat in splats:
-            x, y, z = splat[0], splat[1], splat[2]
-            r, g, b = splat[10], splat[11], splat[12]
-            f.write(f"{x} {y} {z} {int(r * 255)} {int(g * 255)} {int(b * 255)}\n")
+        rgb = (splats['color'] * 255).astype(np.int32)
+        body = np.column_stack([splats['pos'], rgb])
+        np.savetxt(f, body, fmt="%.6g %.6g %.6g %d %d %d")
 
 def write_xyz_file(filename, splats):
     """Write splats as an XYZ file"""
+    check_splats(splats)
     with open(filename, 'w') as f:
-        for splat in splats:
-            x, y, z = splat[0], splat[1], splat[2]
-            r, g, b = splat[10], splat[11], splat[12]
-            f.write(f"{x} {y} {z} {r} {g} {b}\n")
+        np.savetxt(f, np.hstack([splats['pos'], splats['color']]), fmt="%.6g")
 
 if __name__ == "__main__":
     generators = {
+        "example": ("Example Cube + Sphere", create_example_splat),
         "galaxy": ("Spiral Galaxy", create_spiral_galaxy),
         "dna": ("DNA Double Helix", create_dna_helix),
         "knot": ("Torus Knot", create_torus_knot),
     }
 
+    writers = {
+        "splat": (".splat", write_splat_file),
+        "compact": (".compact.splat", write_splat_file_compact),
+        "ply": (".ply", write_ply_file),
+        "xyz": (".xyz", write_xyz_file),
+        "blp": (".splat.blp", write_splat_file_compressed),
+    }
+
+    parser = argparse.ArgumentParser(description="Generate example point cloud files for the 3DGS Viewer")
+    parser.add_argument("--formats", nargs="+", choices=writers, default=["splat"],
+                        help="output formats to write (default: splat)")
+    args = parser.parse_args()
+    formats = list(dict.fromkeys(args.formats))
+    extensions = ", ".join(writers[fmt][0] for fmt in formats)
+
     for name, (label, gen_func) in generators.items():
         print(f"Generating {label}...")
         splats = gen_func()
-        write_splat_file(f"{name}.splat", splats)
-        write_ply_file(f"{name}.ply", splats)
-        write_xyz_file(f"{name}.xyz", splats)
-        print(f"  -> {len(splats)} points in .splat, .ply, .xyz")
+        for ext, write in map(writers.get, formats):
+            write(f"{name}{ext}", splats)
+        print(f"  -> {len(splats)} points in {extensions}")
 
-    print("\nDone! Generated 3 shapes x 3 formats = 9 files.")
+    print(f"\nDone! Generated {len(generators) * len(formats)} files ({len(generators)} shapes x {extensions}).")
     print("Load them in the 3DGS Viewer to see the results.")